@@ -2,15 +2,59 @@ import tkinter as tk
 from tkinter import messagebox, scrolledtext
 from tkinter import ttk
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import tarfile
-import tempfile
+# ISA-L's gzip is a drop-in, much faster inflate; fall back to the stdlib when it isn't installed
+try:
+    from isal import igzip as gzip_impl
+except ImportError:
+    import gzip as gzip_impl
+from concurrent.futures import ThreadPoolExecutor
 import os
+import json
+import email.utils
+import queue
+import threading
+import posixpath
 import re
-import shutil
 
 # Define cache directory
 CACHE_DIR = os.path.join(os.path.expanduser("~"), ".arxiv_cache")
 
+# Number of bytes read from each .tex file when scoring main-file candidates
+SCORE_READ_BYTES = 16384
+
+# Number of threads used to read and score .tex files
+SCORE_WORKERS = 8
+
+# File names that mark the main .tex file outright
+COMMON_NAMES = frozenset({'main.tex', 'paper.tex', 'content.tex', 'article.tex', 'thesis.tex', 'ms.tex', 'manuscript.tex'})
+
+# Only these members are extracted; figures and other assets are never read.
+# Besides LaTeX sources this covers common \input targets such as PGF/TikZ plots,
+# Inkscape .pdf_tex overlays and plain-text tables.
+SOURCE_EXTS = ('.tex', '.bib', '.bbl', '.cls', '.sty', '.clo', '.pgf', '.tikz', '.pdf_tex', '.txt')
+
+# Pre-compiled patterns used while parsing URLs and scanning .tex sources
+_ARXIV_ID_RE = re.compile(r'arxiv\.org/(?:abs|pdf)/([a-z\-]+/\d{7}|(\d+\.\d+))')
+_INPUT_INCLUDE_RE = re.compile(r'\\(?:input|include)\{([^}]+)\}')
+# Matched against raw bytes so scoring never has to decode file contents
+_ESSENTIAL_RE_B = re.compile(rb'\\documentclass|\\begin\{document\}|\\title\{|\\author\{|\\maketitle|\\usepackage')
+
+# Shared HTTP session so repeated downloads reuse the same connection
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]),
+))
+_SESSION.headers.update({
+    'User-Agent': 'arxiv-latex-downloader/1.0 (+https://github.com/sangyun884/arxiv_latex_downloader)',
+    # The e-print is already gzipped; don't let the transport compress it again
+    'Accept-Encoding': 'identity',
+})
+
 def ensure_cache_dir():
     """
     Ensures that the main cache directory exists.
@@ -34,182 +78,498 @@ def is_cached(arxiv_id):
     tar_path = os.path.join(cache_subdir, 'source.tar.gz')
     return os.path.exists(tar_path)
 
-def cache_tar(arxiv_id, tar_path):
-    """
-    Copies the downloaded tar.gz to the cache subdirectory.
-    """
-    cache_subdir = get_cache_subdir(arxiv_id)
-    if not os.path.exists(cache_subdir):
-        os.makedirs(cache_subdir)
-    cached_tar_path = os.path.join(cache_subdir, 'source.tar.gz')
-    shutil.copy(tar_path, cached_tar_path)
-
 def parse_arxiv_id(url):
     """
     Extracts the arXiv ID from a given arXiv URL.
     """
-    match = re.search(r'arxiv\.org/(?:abs|pdf)/([a-z\-]+/\d{7}|(\d+\.\d+))', url)
+    match = _ARXIV_ID_RE.search(url)
     if match:
         return match.group(1)
     return None
 
-def download_source(arxiv_id, progress_callback=None):
+class _TeeReader:
+    """
+    File-like wrapper that copies every block read from raw into sink.
+    """
+    def __init__(self, raw, sink):
+        self.raw = raw
+        self.sink = sink
+
+    def read(self, size=-1):
+        data = self.raw.read(size)
+        if data:
+            self.sink.write(data)
+        return data
+
+    def readinto(self, buffer):
+        n = self.raw.readinto(buffer)
+        if n:
+            self.sink.write(memoryview(buffer)[:n])
+        return n
+
+def load_cache_meta(cache_subdir):
+    """
+    Loads the HTTP validators (ETag / Last-Modified) saved alongside a cached source.
+    """
+    try:
+        with open(os.path.join(cache_subdir, 'meta.json'), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return meta if isinstance(meta, dict) else {}
+
+def save_cache_meta(cache_subdir, response):
     """
-    Downloads the LaTeX source as a tar.gz file from arXiv.
-    Implements caching to avoid re-downloading existing sources.
+    Saves the HTTP validators from an arXiv response alongside the cached source.
+    """
+    meta = {
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+    }
+    try:
+        with open(os.path.join(cache_subdir, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+    except OSError as e:
+        print(f"Error saving cache metadata: {e}")
+
+def _remove_extracted_sources(cache_subdir):
+    """
+    Removes previously extracted sources so a refreshed archive doesn't leave stale files behind.
+    """
+    for entry in _iter_files(cache_subdir):
+        if entry.name.lower().endswith(SOURCE_EXTS):
+            try:
+                os.remove(entry.path)
+            except OSError as e:
+                print(f"Error removing file {entry.name}: {e}")
+
+def stream_and_extract(arxiv_id, progress_callback=None):
+    """
+    Downloads the LaTeX source from arXiv and extracts it while it streams in.
+    The raw tar.gz bytes are written to the cache at the same time. A cached source
+    is revalidated with a conditional GET and extracted from disk if arXiv reports
+    it unchanged (or cannot be reached).
+    Returns (extract_path, failed_step), where failed_step is None on success,
+    otherwise "download" or "extract".
     """
     cache_subdir = get_cache_subdir(arxiv_id)
     tar_path = os.path.join(cache_subdir, 'source.tar.gz')
-    
-    if is_cached(arxiv_id):
+
+    def use_cache():
         if progress_callback:
             progress_callback("Using cached source...")
-        return tar_path, cache_subdir
-    
+        if not extract_tar(tar_path, cache_subdir, progress_callback):
+            return None, "extract"
+        return cache_subdir, None
+
+    headers = {}
+    cached = is_cached(arxiv_id)
+    if cached:
+        meta = load_cache_meta(cache_subdir)
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        # Without stored validators, ask whether anything changed since the archive was written
+        if not headers:
+            try:
+                headers['If-Modified-Since'] = email.utils.formatdate(os.path.getmtime(tar_path), usegmt=True)
+            except OSError:
+                return use_cache()
+        if progress_callback:
+            progress_callback("Checking for updated source...")
+
     url = f'https://arxiv.org/e-print/{arxiv_id}'
     try:
-        response = requests.get(url, stream=True)
-        if response.status_code == 200:
-            if progress_callback:
-                progress_callback("Downloading source...")
-            temp_dir = tempfile.mkdtemp()
-            temp_tar_path = os.path.join(temp_dir, 'source.tar.gz')
-            with open(temp_tar_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=1024):
-                    if chunk:
-                        f.write(chunk)
-            # Cache the downloaded tar.gz
-            cache_tar(arxiv_id, temp_tar_path)
-            shutil.rmtree(temp_dir)  # Clean up temporary directory
-            return tar_path, cache_subdir
-        else:
-            return None, None
+        response = _SESSION.get(url, stream=True, timeout=(5, 30), headers=headers)
     except Exception as e:
         print(f"Error downloading source: {e}")
-        return None, None
+        if cached:
+            return use_cache()
+        return None, "download"
+    with response:
+        if cached and response.status_code != 200:
+            # 304 Not Modified, or arXiv is unavailable: the cached copy is still the best source
+            return use_cache()
+        if response.status_code != 200:
+            return None, "download"
+        if progress_callback:
+            progress_callback("Downloading and extracting source...")
+        os.makedirs(cache_subdir, exist_ok=True)
+        if cached:
+            _remove_extracted_sources(cache_subdir)
+        failed_step = _stream_into_cache(response, cache_subdir, tar_path)
+    if failed_step and cached:
+        # The new archive was unusable, but the previously cached one is still intact
+        _remove_extracted_sources(cache_subdir)
+        return use_cache()
+    if failed_step:
+        return None, failed_step
+    return cache_subdir, None
+
+def _stream_into_cache(response, cache_subdir, tar_path):
+    """
+    Extracts the response body as it streams in while teeing the raw bytes into the
+    cached tar.gz. The cached archive is only replaced once the body has fully arrived.
+    Returns None on success, otherwise "download" or "extract".
+    """
+    part_path = tar_path + '.part'
+    try:
+        with open(part_path, 'wb', buffering=1 << 20) as f:
+            tee = _TeeReader(response.raw, f)
+            try:
+                # Pipe mode never seeks, so members are extracted as they arrive
+                with gzip_impl.GzipFile(fileobj=tee, mode='rb') as gz, \
+                        tarfile.open(fileobj=gz, mode='r|') as tar:
+                    _extract_sources(tar, cache_subdir)
+            except (tarfile.TarError, OSError, EOFError) as e:
+                print(f"Error extracting tar.gz: {e}")
+                return "extract"
+            # Pull any trailing padding so the cached archive is complete
+            while tee.read(64 * 1024):
+                pass
+        os.replace(part_path, tar_path)
+        save_cache_meta(cache_subdir, response)
+    except Exception as e:
+        print(f"Error downloading source: {e}")
+        return "download"
+    finally:
+        if os.path.exists(part_path):
+            os.unlink(part_path)
+    return None
+
+def _extract_sources(tar, extract_path):
+    """
+    Extracts only the LaTeX source members of an open tar stream.
+    Members whose path would land outside extract_path are skipped.
+    """
+    root = os.path.realpath(extract_path)
+    # The 'data' filter also strips unsafe modes and owners where tarfile supports it
+    extract_kwargs = {'filter': 'data'} if hasattr(tarfile, 'data_filter') else {}
+    for member in tar:
+        if not (member.isfile() and member.name.lower().endswith(SOURCE_EXTS)):
+            continue
+        target = os.path.realpath(os.path.join(root, member.name))
+        if os.path.commonpath([root, target]) != root:
+            print(f"Skipping unsafe archive member: {member.name}")
+            continue
+        tar.extract(member, extract_path, **extract_kwargs)
 
 def extract_tar(tar_path, extract_path, progress_callback=None):
     """
-    Extracts the tar.gz file to the specified directory.
+    Extracts the LaTeX sources in the tar.gz file to the specified directory.
     """
     try:
         if progress_callback:
             progress_callback("Extracting files...")
-        with tarfile.open(tar_path, 'r:gz') as tar:
-            tar.extractall(path=extract_path)
+        # Pipe mode reads the archive in a single pass without building an index
+        with gzip_impl.open(tar_path, 'rb') as gz, tarfile.open(fileobj=gz, mode='r|') as tar:
+            _extract_sources(tar, extract_path)
         return True
     except Exception as e:
         print(f"Error extracting tar.gz: {e}")
         return False
 
+def _iter_files(root):
+    """
+    Yields a DirEntry for every file under root, walking with os.scandir.
+    """
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file():
+                        yield entry
+        except OSError as e:
+            print(f"Error scanning {current}: {e}")
+
+def _score_file(file):
+    """
+    Scores a .tex file by how many essential LaTeX commands its head contains.
+    Returns (score, head_bytes), or None if the file cannot be read.
+    """
+    try:
+        # The essential commands live in the preamble, so only the head is scanned
+        with open(file, 'rb') as f:
+            head = f.read(SCORE_READ_BYTES)
+    except Exception as e:
+        print(f"Error reading {file}: {e}")
+        return None
+    # One scan for all commands; each distinct command counts once
+    return len(set(_ESSENTIAL_RE_B.findall(head))), head
+
 def find_main_tex(extract_path):
     """
     Attempts to find the main .tex file in the extracted source using enhanced heuristics.
-    """
-    tex_files = []
-    for root, dirs, files in os.walk(extract_path):
-        for file in files:
-            if file.endswith('.tex'):
-                tex_files.append(os.path.join(root, file))
+    Returns (main_tex, content_cache), where content_cache maps the real path of every
+    .tex file that was read in full while scoring to its raw bytes.
+    """
+    content_cache = {}
+    # Resolve the root once so paths line up with the realpaths used by inline_tex
+    extract_path = os.path.realpath(extract_path)
+    # Shallowest files first, then by name, so the pick never depends on directory order
+    tex_files = sorted((e.path for e in _iter_files(extract_path) if e.name.endswith('.tex')),
+                       key=lambda p: (p.count(os.sep), p))
     if not tex_files:
-        return None
+        return None, content_cache
 
     # Heuristic 1: Check for common main file names
-    common_names = ['main.tex', 'paper.tex', 'content.tex', 'article.tex', 'thesis.tex']
-    for file in tex_files:
-        if os.path.basename(file).lower() in common_names:
-            return file
+    basenames = [os.path.basename(file).lower() for file in tex_files]
+    for file, basename in zip(tex_files, basenames):
+        if basename in COMMON_NAMES:
+            return file, content_cache
 
     # Heuristic 2: Search for essential LaTeX commands
+    # Reads release the GIL, so each batch is scored concurrently to overlap its I/O.
+    # Batches are only submitted once the previous one is checked, so finding the
+    # main file early skips reading the remaining candidates.
     candidate_scores = {}
-    essential_commands = [
-        r'\\documentclass',
-        r'\\begin\{document\}',
-        r'\\title\{',
-        r'\\author\{',
-        r'\\maketitle',
-        r'\\usepackage'
-    ]
-
-    for file in tex_files:
-        try:
-            with open(file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            score = 0
-            for cmd in essential_commands:
-                if re.search(cmd, content):
-                    score += 1
-            candidate_scores[file] = score
-        except Exception as e:
-            print(f"Error reading {file}: {e}")
-            continue
+    with ThreadPoolExecutor(max_workers=SCORE_WORKERS) as ex:
+        for start in range(0, len(tex_files), SCORE_WORKERS):
+            batch = tex_files[start:start + SCORE_WORKERS]
+            for file, result in zip(batch, ex.map(_score_file, batch)):
+                if result is None:
+                    continue
+                score, head = result
+                candidate_scores[file] = score
+                # Small files were read in full, so keep them for inline_tex
+                if len(head) < SCORE_READ_BYTES:
+                    content_cache[file] = head
+                # A file with both \documentclass and \begin{document} is definitively the main file
+                if b'\\documentclass' in head and b'\\begin{document}' in head:
+                    return file, content_cache
 
     if candidate_scores:
         # Select the file with the highest score
         main_tex = max(candidate_scores, key=candidate_scores.get)
         if candidate_scores[main_tex] > 0:
-            return main_tex
+            return main_tex, content_cache
 
-    # Heuristic 3: Largest .tex file
-    tex_files_sorted = sorted(tex_files, key=lambda x: os.path.getsize(x), reverse=True)
-    return tex_files_sorted[0]
+    # Heuristic 3: Largest .tex file (sizes are only needed here, so stat lazily)
+    def size(path):
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return -1
+
+    return max(tex_files, key=size), content_cache
 
-def inline_tex(file_path, extract_path, included_files=None, depth=0, max_depth=10):
+def _read_tex(file_path, content_cache=None):
     """
-    Recursively inlines \input and \include commands.
+    Reads a .tex file, preferring bytes already held in content_cache.
+    Returns None if the file cannot be read.
     """
-    if included_files is None:
-        included_files = set()
-    if depth > max_depth:
-        raise RecursionError("Maximum recursion depth reached while inlining files.")
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        data = content_cache.get(file_path) if content_cache else None
+        if data is None:
+            with open(file_path, 'rb') as f:
+                data = f.read()
+        # Match text-mode reads, which translate all newline styles to '\n'
+        return data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
     except Exception as e:
         print(f"Error reading {file_path}: {e}")
-        return f"% Error reading file: {os.path.basename(file_path)}\n"
+        return None
 
-    # Regex patterns to find \input{...} and \include{...}
-    pattern = re.compile(r'\\(?:input|include)\{([^}]+)\}')
-
-    def replace_match(match):
-        relative_path = match.group(1)
-        # Append .tex if not present
-        if not relative_path.endswith('.tex'):
-            relative_path += '.tex'
-        included_path = os.path.join(os.path.dirname(file_path), relative_path)
-        # Normalize the path
-        included_path = os.path.normpath(included_path)
-        if included_path in included_files:
-            return f"% Skipping already included file: {relative_path}\n"
-        if not os.path.exists(included_path):
-            return f"% File not found: {relative_path}\n"
-        included_files.add(included_path)
-        try:
-            return inline_tex(included_path, extract_path, included_files, depth + 1, max_depth)
-        except RecursionError:
-            return f"% Recursion limit reached while including: {relative_path}\n"
+def _build_file_index(extract_path):
+    """
+    Indexes every file under extract_path by its '/'-separated relative path.
+    Returns (exact, folded): exact maps each path to the full path, and folded maps
+    lowercased paths to the full path, leaving out names shared by files that differ only in case.
+    """
+    exact = {os.path.relpath(e.path, extract_path).replace(os.sep, '/'): e.path
+             for e in _iter_files(extract_path)}
+    folded = {}
+    for key, path in exact.items():
+        # Ambiguous names map to None so the fallback never depends on scan order
+        folded[key.lower()] = None if key.lower() in folded else path
+    return exact, folded
+
+def _resolve_include(name, current_path, extract_path, file_index):
+    """
+    Resolves an \\input/\\include target against the file index, trying the including
+    file's directory first and then the source root, with and without a .tex suffix.
+    Exact matches are preferred; a case-insensitive match is only used when none exists.
+    Returns None if no file matches.
+    """
+    names = [name] if name.endswith('.tex') else [name + '.tex', name]
+    current_dir = os.path.relpath(os.path.dirname(current_path), extract_path).replace(os.sep, '/')
+    keys = [posixpath.normpath(posixpath.join(base, candidate))
+            for base in (current_dir, '') for candidate in names]
+    exact, folded = file_index
+    for key in keys:
+        if key in exact:
+            return exact[key]
+    for key in keys:
+        path = folded.get(key.lower())
+        if path is not None:
+            return path
+    return None
 
-    # Replace all \input and \include with the actual content
-    inlined_content = pattern.sub(replace_match, content)
-    return inlined_content
+def inline_tex(file_path, extract_path, max_depth=10, content_cache=None):
+    """
+    Inlines \\input and \\include commands, walking nested files with an explicit stack.
+    Each file's fully inlined text is memoized, so a file included from several
+    places is expanded only once.
+    """
+    if content_cache is None:
+        content_cache = {}
+    content = _read_tex(file_path, content_cache)
+    if content is None:
+        return f"% Error reading file: {os.path.basename(file_path)}\n"
 
-def combine_tex_files(main_tex, extract_path, progress_callback=None):
+    # Index the tree once so includes resolve without probing the filesystem
+    extract_path = os.path.realpath(extract_path)
+    file_index = _build_file_index(extract_path)
+    # Fully inlined text of every file finished so far, keyed by path
+    expanded = {}
+    file_path = os.path.realpath(file_path)
+    # Files on the current include chain; only these indicate a cycle
+    active = {file_path}
+    # Files whose text was cut short by a cycle or the depth limit. That text depends on
+    # the include chain it was expanded under, so it is never memoized.
+    truncated = set()
+    # Each frame is (path, tokens, index of the next token, output pieces). Splitting on the
+    # include pattern yields literal text at even indices and include targets at odd ones.
+    stack = [(file_path, _INPUT_INCLUDE_RE.split(content), 0, [])]
+    while True:
+        current_path, tokens, i, out = stack.pop()
+        while i < len(tokens):
+            token = tokens[i]
+            i += 1
+            if i % 2:
+                out.append(token)
+                continue
+            relative_path = token
+            # Append .tex if not present
+            if not relative_path.endswith('.tex'):
+                relative_path += '.tex'
+            included_path = _resolve_include(token, current_path, extract_path, file_index)
+            if included_path is None:
+                out.append(f"% File not found: {relative_path}\n")
+                continue
+            if included_path in active:
+                out.append(f"% Skipping circular include: {relative_path}\n")
+                truncated.add(current_path)
+                continue
+            if included_path in expanded:
+                out.append(expanded[included_path])
+                continue
+            # The popped frame sits at depth len(stack), so the child is one deeper
+            if len(stack) + 1 > max_depth:
+                out.append(f"% Recursion limit reached while including: {relative_path}\n")
+                truncated.add(current_path)
+                continue
+            included_content = _read_tex(included_path, content_cache)
+            if included_content is None:
+                out.append(f"% Error reading file: {os.path.basename(included_path)}\n")
+                continue
+            # Resume this file after the child has been fully emitted
+            stack.append((current_path, tokens, i, out))
+            stack.append((included_path, _INPUT_INCLUDE_RE.split(included_content), 0, []))
+            active.add(included_path)
+            truncated.discard(included_path)
+            break
+        else:
+            # Every token of this file is emitted; hand its text to the includer
+            text = ''.join(out)
+            active.discard(current_path)
+            if not stack:
+                return text
+            if current_path in truncated:
+                truncated.add(stack[-1][0])
+            else:
+                expanded[current_path] = text
+            stack[-1][3].append(text)
+
+def combine_tex_files(main_tex, extract_path, progress_callback=None, content_cache=None):
     """
     Combines multiple .tex files into a single LaTeX source.
     """
     try:
         if progress_callback:
             progress_callback("Combining .tex files...")
-        combined = inline_tex(main_tex, extract_path)
+        combined = inline_tex(main_tex, extract_path, content_cache=content_cache)
         return combined
-    except RecursionError as e:
-        messagebox.showerror("Error", str(e))
+    except Exception as e:
+        print(f"Error combining .tex files: {e}")
         return None
 
-def process_arxiv_link(arxiv_url, text_widget, progress_bar, status_label):
+def _pipeline(arxiv_id, q):
+    """
+    Runs download, extraction and inlining on a worker thread.
+    Progress is reported to the GUI through q as tuples:
+    ("status", text), ("error", title, message, status) and ("done", combined_tex).
+    """
+    try:
+        status = lambda s: q.put(("status", s))
+
+        # Step 1: Download and Extract Source
+        extract_path, failed_step = stream_and_extract(arxiv_id, progress_callback=status)
+        if failed_step == "download":
+            q.put(("error", "Download Failed", "Could not download the LaTeX source. Please check the arXiv ID.",
+                   "Download failed."))
+            return
+        if failed_step == "extract":
+            q.put(("error", "Extraction Failed", "Could not extract the LaTeX source.", "Extraction failed."))
+            return
+
+        # Step 2: Find Main .tex File
+        main_tex, content_cache = find_main_tex(extract_path)
+        if not main_tex:
+            q.put(("error", "No .tex File Found", "Could not find any .tex files in the source.", "No .tex file found."))
+            return
+
+        status(f"Main .tex file found: {os.path.basename(main_tex)}")
+
+        # Step 3: Combine .tex Files
+        combined_tex = combine_tex_files(main_tex, extract_path, progress_callback=status, content_cache=content_cache)
+        if combined_tex is None:
+            q.put(("error", "Error", "Could not combine the .tex files.", "Combining failed."))
+            return
+
+        q.put(("done", combined_tex))
+    except Exception as e:
+        # Always report back, otherwise the GUI keeps polling with the Download button disabled
+        print(f"Error processing {arxiv_id}: {e}")
+        q.put(("error", "Error", f"An unexpected error occurred: {e}", "Failed."))
+
+def _drain(root, q, text_widget, progress_bar, status_label, download_button):
+    """
+    Applies queued pipeline updates on the Tk main loop, rescheduling itself until the pipeline finishes.
+    """
+    while True:
+        try:
+            kind, *args = q.get_nowait()
+        except queue.Empty:
+            break
+        if kind == "status":
+            update_status(status_label, args[0])
+            continue
+        if kind == "error":
+            title, message, status = args
+            download_button.config(state=tk.NORMAL)
+            update_progress(progress_bar, status_label, 0, status)
+            root.after(0, lambda: messagebox.showerror(title, message))
+        else:
+            # Step 4: Display Combined LaTeX Source
+            def finish():
+                download_button.config(state=tk.NORMAL)
+                update_progress(progress_bar, status_label, 100, "Completed.")
+
+            text_widget.delete(1.0, tk.END)
+            update_status(status_label, "Displaying LaTeX source...")
+            insert_text_chunked(text_widget, args[0], on_done=finish)
+        return
+    root.after(50, _drain, root, q, text_widget, progress_bar, status_label, download_button)
+
+def process_arxiv_link(arxiv_url, root, text_widget, progress_bar, status_label, download_button):
     """
     Main processing function to handle the arXiv link and display the LaTeX source.
+    The network and file work runs on a background thread so the GUI stays responsive.
     """
     arxiv_id = parse_arxiv_id(arxiv_url)
     if not arxiv_id:
@@ -218,61 +578,25 @@ def process_arxiv_link(arxiv_url, text_widget, progress_bar, status_label):
 
     text_widget.delete(1.0, tk.END)
     update_progress(progress_bar, status_label, 0, "Starting process...")
+    download_button.config(state=tk.DISABLED)
 
-    # Step 1: Download Source
-    def step1(status):
-        update_status(status_label, status)
+    q = queue.Queue()
+    threading.Thread(target=_pipeline, args=(arxiv_id, q), daemon=True).start()
+    root.after(50, _drain, root, q, text_widget, progress_bar, status_label, download_button)
 
-    tar_path, extract_path = download_source(arxiv_id, progress_callback=step1)
-    if not tar_path:
-        messagebox.showerror("Download Failed", "Could not download the LaTeX source. Please check the arXiv ID.")
-        update_progress(progress_bar, status_label, 0, "Download failed.")
-        return
-
-    # Step 2: Extract Files
-    success = extract_tar(tar_path, extract_path, progress_callback=lambda s: update_status(status_label, s))
-    if not success:
-        messagebox.showerror("Extraction Failed", "Could not extract the LaTeX source.")
-        update_progress(progress_bar, status_label, 0, "Extraction failed.")
-        return
-
-    # Step 3: Find Main .tex File
-    main_tex = find_main_tex(extract_path)
-    if not main_tex:
-        messagebox.showerror("No .tex File Found", "Could not find any .tex files in the source.")
-        update_progress(progress_bar, status_label, 0, "No .tex file found.")
-        return
-
-    update_status(status_label, f"Main .tex file found: {os.path.basename(main_tex)}")
-
-    # Step 4: Combine .tex Files
-    combined_tex = combine_tex_files(main_tex, extract_path, progress_callback=lambda s: update_status(status_label, s))
-    if combined_tex is None:
-        # Optionally, cleanup extracted files if needed
-        # shutil.rmtree(extract_path, ignore_errors=True)
-        update_progress(progress_bar, status_label, 0, "Combining failed.")
-        return
-
-    # Step 5: Display Combined LaTeX Source
-    text_widget.delete(1.0, tk.END)
-    text_widget.insert(tk.END, combined_tex)
-    update_progress(progress_bar, status_label, 100, "Completed.")
-
-    # Optional: Remove image files to save space (uncomment if desired)
-    # remove_image_files(extract_path)
-
-def remove_image_files(extract_path):
+def insert_text_chunked(text_widget, text, chunk_size=65536, on_done=None):
     """
-    Removes image files from the extracted source to save space.
+    Inserts text into the widget one chunk per event-loop pass, so the UI keeps
+    handling input while large sources are displayed. Calls on_done after the last chunk.
     """
-    image_extensions = ['.jpg', '.jpeg', '.png', '.pdf', '.gif', '.bmp', '.svg']
-    for root, dirs, files in os.walk(extract_path):
-        for file in files:
-            if any(file.lower().endswith(ext) for ext in image_extensions):
-                try:
-                    os.remove(os.path.join(root, file))
-                except Exception as e:
-                    print(f"Error removing file {file}: {e}")
+    def insert_from(start):
+        text_widget.insert(tk.END, text[start:start + chunk_size])
+        if start + chunk_size < len(text):
+            text_widget.after(0, insert_from, start + chunk_size)
+        elif on_done:
+            on_done()
+
+    insert_from(0)
 
 def update_progress(progress_bar, status_label, value, status):
     """
@@ -280,15 +604,12 @@ def update_progress(progress_bar, status_label, value, status):
     """
     progress_bar['value'] = value
     status_label.config(text=status)
-    progress_bar.update()
-    status_label.update()
 
 def update_status(status_label, status):
     """
     Updates the status label.
     """
     status_label.config(text=status)
-    status_label.update()
 
 def copy_to_clipboard(root, text_widget):
     """
@@ -323,7 +644,8 @@ def create_gui():
     url_entry.grid(row=0, column=1, padx=5, pady=5, sticky=tk.W)
 
     download_button = tk.Button(input_frame, text="Download", width=15, 
-                                command=lambda: process_arxiv_link(url_entry.get().strip(), text_area, progress_bar, status_label))
+                                command=lambda: process_arxiv_link(url_entry.get().strip(), root, text_area, progress_bar,
+                                                                   status_label, download_button))
     download_button.grid(row=0, column=2, padx=5, pady=5, sticky=tk.W)
 
     # Configure grid weights to make the entry expand